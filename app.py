@@ -1,91 +1,242 @@
 from flask import Flask, render_template, request, jsonify
+import base64
+import json
+import orjson
 import pymysql
+import hashlib
+import queue
+import re
+import threading
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import pytz
-from app_config import *
+from app_config import APP_CONFIG, DB_CONFIG, RETENTION_DAYS
 
 app = Flask(__name__)
 
+# Cache for /api/logs COUNT(*) results, keyed by (where_sql, params). The count
+# query is often far slower than the LIMITed data query on large tables, and
+# pagination clicks re-issue it with identical filters.
+count_cache = TTLCache(maxsize=256, ttl=60)
+count_cache_lock = threading.Lock()
+
+# Cache for /api/filter_options. The four SELECT DISTINCT scans are full
+# column scans on a big table but their results change slowly, so serve a
+# cached copy and refresh in the background every five minutes.
+FILTER_OPTIONS_TTL = 300
+filter_options_cache = TTLCache(maxsize=1, ttl=FILTER_OPTIONS_TTL)
+filter_options_lock = threading.Lock()
+
+# Cache for /api/statistics. The endpoint runs several aggregate queries but
+# its figures change slowly, so refresh-happy dashboards get a cached copy.
+STATISTICS_TTL = 30
+statistics_cache = TTLCache(maxsize=1, ttl=STATISTICS_TTL)
+statistics_lock = threading.Lock()
+
+class PooledConnection:
+    """Thin wrapper around a pymysql connection that returns it to the pool on close()"""
+    def __init__(self, conn, pool):
+        self._conn = conn
+        self._pool = pool
+
+    def __getattr__(self, name):
+        # Delegate everything else (cursor, commit, rollback, ...) to the real connection
+        return getattr(self._conn, name)
+
+    def close(self):
+        """Return the underlying connection to the pool instead of closing the socket"""
+        self._pool.put_conn(self._conn)
+
+
+class DBConnectionPool:
+    """Simple thread-safe pymysql connection pool.
+
+    Keeps up to max_size connections open and reuses them across requests,
+    avoiding a fresh TCP/auth handshake on every API call.
+    """
+    def __init__(self, min_size=5, max_size=20):
+        self._pool = queue.Queue(maxsize=max_size)
+        self._max_size = max_size
+        self._size = 0
+        self._lock = threading.Lock()
+        for _ in range(min_size):
+            self._pool.put(self._create_conn())
+
+    def _create_conn(self):
+        with self._lock:
+            self._size += 1
+        return pymysql.connect(**DB_CONFIG)
+
+    def get_conn(self):
+        """Get a connection from the pool, creating one if the pool is empty and under max_size"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                under_limit = self._size < self._max_size
+            if under_limit:
+                conn = self._create_conn()
+            else:
+                # Pool exhausted; block until a connection is returned
+                conn = self._pool.get()
+        # Revive stale connections (e.g. dropped by wait_timeout)
+        conn.ping(reconnect=True)
+        return PooledConnection(conn, self)
+
+    def put_conn(self, conn):
+        """Return a connection to the pool, closing it if the pool is full"""
+        # End the connection's open transaction before reuse. pymysql runs
+        # with autocommit off, so the first SELECT opens a REPEATABLE READ
+        # snapshot that would otherwise live for the connection's whole
+        # pooled lifetime - every later request would read that same stale
+        # snapshot and never see newly ingested logs.
+        try:
+            conn.rollback()
+        except Exception:
+            # Broken connection: drop it instead of re-queueing
+            with self._lock:
+                self._size -= 1
+            try:
+                conn.close()
+            except Exception:
+                pass
+            return
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            with self._lock:
+                self._size -= 1
+            conn.close()
+
+
+db_pool = DBConnectionPool()
+
 def get_db_connection():
-    """Create and return a database connection"""
-    return pymysql.connect(**DB_CONFIG)
+    """Get a pooled database connection; close() returns it to the pool"""
+    return db_pool.get_conn()
 
-def convert_timezone(dt_str, target_tz):
-    """Convert UTC datetime string to target timezone"""
-    if not dt_str:
-        return dt_str
-    try:
-        # Parse the datetime string
-        dt = datetime.strptime(dt_str, '%Y-%m-%d %H:%M:%S')
-        # Assume it's UTC
-        dt_utc = pytz.utc.localize(dt)
-        # Convert to target timezone
-        target_timezone = pytz.timezone(target_tz)
-        dt_target = dt_utc.astimezone(target_timezone)
-        return dt_target.strftime('%Y-%m-%d %H:%M:%S')
-    except Exception as e:
-        print(f"Timezone conversion error: {e}, dt_str={dt_str}, target_tz={target_tz}")
-        return dt_str
+# Curated list of common timezones (one per UTC offset) shown in the page
+# dropdowns. Frozen at import time so the routes don't rebuild it per request;
+# the frozenset below gives O(1) validation of the /api/logs timezone
+# parameter. These are IANA names, which MySQL's CONVERT_TZ resolves once the
+# server's time zone tables are loaded (mysql_tzinfo_to_sql /usr/share/zoneinfo).
+COMMON_TIMEZONES = (
+    'UTC',
+    'US/Pacific',
+    'US/Mountain',
+    'US/Central',
+    'US/Eastern',
+    'America/Caracas',
+    'America/Santiago',
+    'America/Sao_Paulo',
+    'Atlantic/Cape_Verde',
+    'Europe/London',
+    'Europe/Paris',
+    'Europe/Athens',
+    'Africa/Nairobi',
+    'Asia/Dubai',
+    'Asia/Karachi',
+    'Asia/Kolkata',
+    'Asia/Dhaka',
+    'Asia/Bangkok',
+    'Asia/Hong_Kong',
+    'Asia/Tokyo',
+    'Australia/Sydney',
+    'Pacific/Auckland'
+)
+ACCEPTED_TIMEZONES = frozenset(COMMON_TIMEZONES)
+
+# Columns returned by /api/logs. An explicit list keeps the wide TEXT
+# description column and any future additions from bloating every response.
+LOG_COLUMNS = (
+    'id', 'received_timestamp', 'hostname', 'os', 'event_timestamp',
+    'rule_uuid', 'rule_name', 'event_type', 'source', 'destination',
+    'protocol', 'source_port', 'destination_port', 'action', 'direction',
+    'originator_packets', 'originator_bytes', 'reply_packets', 'reply_bytes',
+    'description'
+)
+
+# WHERE-clause templates for /api/logs, precompiled at import time. Each entry
+# is (query param, SQL clause, wrap value in LIKE wildcards). Keeping the
+# clause text fixed means the finite set of filter combinations produces a
+# small, reusable set of SQL strings, which also helps MySQL's statement
+# digest and plan caches.
+LOG_FILTERS = (
+    ('hostname', "hostname LIKE %s", True),
+    ('source', "source LIKE %s", True),
+    ('destination', "destination LIKE %s", True),
+    ('action', "action = %s", False),
+    ('protocol', "protocol = %s", False),
+    ('rule_name', "rule_name LIKE %s", True),
+    ('start_time', "received_timestamp >= %s", False),
+    ('end_time', "received_timestamp <= %s", False),
+)
+LOG_FILTER_CLAUSES = {name: clause for name, clause, _ in LOG_FILTERS}
+
+# Boolean-mode FULLTEXT variants of the substring filters. A '%xxx%' LIKE
+# can never use a B-tree index and scans the whole table; MATCH ... AGAINST
+# with a +token* prefix query is an index lookup instead. Only plain
+# word tokens qualify - values containing '.', '-', spaces, etc. would be
+# split or treated as boolean operators by the FULLTEXT parser, so they
+# fall back to LIKE.
+LOG_FILTER_CLAUSES.update({
+    'hostname:ft': "MATCH(hostname) AGAINST (%s IN BOOLEAN MODE)",
+    'source:ft': "MATCH(source) AGAINST (%s IN BOOLEAN MODE)",
+    'destination:ft': "MATCH(destination) AGAINST (%s IN BOOLEAN MODE)",
+    'rule_name:ft': "MATCH(rule_name) AGAINST (%s IN BOOLEAN MODE)",
+})
+_FULLTEXT_TOKEN_RE = re.compile(r'^\w{3,}$')
+
+# Rendered SQL strings for /api/logs, keyed by the structural parts of the
+# query (active filters, column list, sort, pagination style). Bounded by the
+# finite filter/sort combinations plus whatever &fields= variants clients use.
+_logs_sql_cache = {}
+_LOGS_SQL_CACHE_MAX = 1024
+
+def _epoch_ms(dt):
+    """Convert a naive UTC datetime (as returned by pymysql) to epoch milliseconds"""
+    return int(dt.replace(tzinfo=pytz.utc).timestamp() * 1000)
+
+def _json_response(payload, status=200):
+    """Serialize an API payload with orjson (C-level, much faster than stdlib json).
+
+    Stray non-native types (datetime, Decimal) fall back to str(), matching
+    how Flask's default JSON provider renders them.
+    """
+    return app.response_class(
+        orjson.dumps(payload, default=str),
+        status=status,
+        mimetype='application/json'
+    )
+
+def _cacheable_json_response(payload, max_age):
+    """JSON response with ETag/Cache-Control for data that changes slowly.
+
+    Matching If-None-Match requests short-circuit to an empty 304, and
+    browsers reuse the payload for max_age seconds (serving stale for
+    another max_age while revalidating) without hitting the database.
+    """
+    body = orjson.dumps(payload, default=str)
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    cache_control = f'public, max-age={max_age}, stale-while-revalidate={max_age * 2}'
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
 
 @app.route('/')
 def index():
     """Main page with the logs table"""
-    # Curated list of common timezones (one per UTC offset)
-    common_timezones = [
-        'UTC',
-        'US/Pacific',
-        'US/Mountain',
-        'US/Central',
-        'US/Eastern',
-        'America/Caracas',
-        'America/Santiago',
-        'America/Sao_Paulo',
-        'Atlantic/Cape_Verde',
-        'Europe/London',
-        'Europe/Paris',
-        'Europe/Athens',
-        'Africa/Nairobi',
-        'Asia/Dubai',
-        'Asia/Karachi',
-        'Asia/Kolkata',
-        'Asia/Dhaka',
-        'Asia/Bangkok',
-        'Asia/Hong_Kong',
-        'Asia/Tokyo',
-        'Australia/Sydney',
-        'Pacific/Auckland'
-    ]
-    return render_template('index.html', timezones=common_timezones)
+    return render_template('index.html', timezones=COMMON_TIMEZONES)
 
 @app.route('/analytics')
 def analytics():
     """Analytics page with traffic graphs"""
-    # Curated list of common timezones (one per UTC offset)
-    common_timezones = [
-        'UTC',
-        'US/Pacific',
-        'US/Mountain',
-        'US/Central',
-        'US/Eastern',
-        'America/Caracas',
-        'America/Santiago',
-        'America/Sao_Paulo',
-        'Atlantic/Cape_Verde',
-        'Europe/London',
-        'Europe/Paris',
-        'Europe/Athens',
-        'Africa/Nairobi',
-        'Asia/Dubai',
-        'Asia/Karachi',
-        'Asia/Kolkata',
-        'Asia/Dhaka',
-        'Asia/Bangkok',
-        'Asia/Hong_Kong',
-        'Asia/Tokyo',
-        'Australia/Sydney',
-        'Pacific/Auckland'
-    ]
-    return render_template('analytics.html', timezones=common_timezones)
+    return render_template('analytics.html', timezones=COMMON_TIMEZONES)
 
 @app.route('/statistics')
 def statistics():
@@ -99,19 +250,36 @@ def get_logs():
     sort_by = request.args.get('sort', 'received_timestamp')
     sort_order = request.args.get('order', 'DESC')
     
-    # Filtering parameters - using parameterized queries to prevent SQL injection
-    hostname_filter = request.args.get('hostname', '').strip()
-    source_filter = request.args.get('source', '').strip()
-    destination_filter = request.args.get('destination', '').strip()
-    action_filter = request.args.get('action', '').strip()
-    protocol_filter = request.args.get('protocol', '').strip()
-    rule_name_filter = request.args.get('rule_name', '').strip()
-    start_time = request.args.get('start_time', '').strip()
-    end_time = request.args.get('end_time', '').strip()
-    
-    # Timezone for conversion
-    target_tz = request.args.get('timezone', 'UTC')
-    
+    # Filtering parameters - using parameterized queries to prevent SQL
+    # injection. Collect the active filters from the precompiled templates.
+    active_filters = []
+    params = []
+    for name, _, is_like in LOG_FILTERS:
+        value = request.args.get(name, '').strip()
+        if not value:
+            continue
+        if is_like and name + ':ft' in LOG_FILTER_CLAUSES and _FULLTEXT_TOKEN_RE.match(value):
+            # Plain word token: prefix-match via the FULLTEXT index
+            active_filters.append(name + ':ft')
+            params.append(f'+{value}*')
+        else:
+            active_filters.append(name)
+            params.append(f"%{value}%" if is_like else value)
+
+
+    # Keyset pagination cursor: base64-encoded JSON [sort_value, id] of the last
+    # row of the previous page. Much faster than OFFSET on deep pages because
+    # MySQL seeks directly into the index instead of scanning and discarding rows.
+    after = request.args.get('after', '').strip()
+    cursor_sort_value = None
+    cursor_id = None
+    if after:
+        try:
+            cursor_sort_value, cursor_id = json.loads(base64.urlsafe_b64decode(after))
+        except (ValueError, TypeError):
+            cursor_sort_value = None
+            cursor_id = None
+
     # Pagination - validate inputs to prevent division by zero and invalid values
     try:
         page = int(request.args.get('page', 1))
@@ -124,6 +292,8 @@ def get_logs():
         per_page = int(request.args.get('per_page', 100))
         if per_page < 1:
             per_page = 100  # Default to 100 if invalid value provided
+        elif per_page > 1000:
+            per_page = 1000  # Cap to bound per-request memory
     except (ValueError, TypeError):
         per_page = 100
     
@@ -143,284 +313,293 @@ def get_logs():
     if sort_order.upper() not in ['ASC', 'DESC']:
         sort_order = 'DESC'
     
-    # Build WHERE clause with parameterized queries
-    where_clauses = []
-    params = []
-    
-    if hostname_filter:
-        where_clauses.append("hostname LIKE %s")
-        params.append(f"%{hostname_filter}%")
-    
-    if source_filter:
-        where_clauses.append("source LIKE %s")
-        params.append(f"%{source_filter}%")
-    
-    if destination_filter:
-        where_clauses.append("destination LIKE %s")
-        params.append(f"%{destination_filter}%")
-    
-    if action_filter:
-        where_clauses.append("action = %s")
-        params.append(action_filter)
-    
-    if protocol_filter:
-        where_clauses.append("protocol = %s")
-        params.append(protocol_filter)
-    
-    if rule_name_filter:
-        where_clauses.append("rule_name LIKE %s")
-        params.append(f"%{rule_name_filter}%")
-    
-    if start_time:
-        where_clauses.append("received_timestamp >= %s")
-        params.append(start_time)
-    
-    if end_time:
-        where_clauses.append("received_timestamp <= %s")
-        params.append(end_time)
-    
+    # Assemble the WHERE clause from the precompiled templates
     where_sql = ""
-    if where_clauses:
-        where_sql = "WHERE " + " AND ".join(where_clauses)
-    
+    if active_filters:
+        where_sql = "WHERE " + " AND ".join(
+            LOG_FILTER_CLAUSES[name] for name in active_filters)
+
     # Query database
+    # Clients that only need next/prev buttons can skip the count entirely
+    skip_count = request.args.get('skip_count', '').strip() in ('1', 'true')
+
+    # Optional &fields= narrows the column list further (comma-separated,
+    # validated against LOG_COLUMNS); timestamp/id columns are always kept
+    # since pagination cursors and the _ms fields depend on them
+    select_columns = LOG_COLUMNS
+    fields_param = request.args.get('fields', '').strip()
+    if fields_param:
+        requested = {f.strip() for f in fields_param.split(',')}
+        requested.update(('id', 'received_timestamp', 'event_timestamp', sort_by))
+        narrowed = tuple(c for c in LOG_COLUMNS if c in requested)
+        if narrowed:
+            select_columns = narrowed
+    select_sql = ', '.join(select_columns)
+
+    # Optional &timezone= asks MySQL to return display-ready timestamp strings
+    # converted via CONVERT_TZ - useful for API consumers (curl, exports) that
+    # can't run Intl.DateTimeFormat like the web UI does. One SQL expression
+    # replaces per-row conversion work in Python. Requires the server's time
+    # zone tables to be loaded; if they aren't, the _str fields come back null.
+    target_tz = request.args.get('timezone', '').strip()
+    tz_params = []
+    if target_tz and target_tz in ACCEPTED_TIMEZONES:
+        select_sql += (
+            ", DATE_FORMAT(CONVERT_TZ(received_timestamp, '+00:00', %s),"
+            " '%%Y-%%m-%%d %%H:%%i:%%s') AS received_timestamp_str"
+            ", DATE_FORMAT(CONVERT_TZ(event_timestamp, '+00:00', %s),"
+            " '%%Y-%%m-%%d %%H:%%i:%%s') AS event_timestamp_str"
+        )
+        tz_params = [target_tz, target_tz]
+
     conn = get_db_connection()
     try:
         with conn.cursor() as cursor:
-            # Get total count
-            count_sql = f"SELECT COUNT(*) as total FROM fns_logs {where_sql}"
-            cursor.execute(count_sql, params)
-            total = cursor.fetchone()['total']
-            
-            # Get logs
-            sql = f"""
-                SELECT * FROM fns_logs 
-                {where_sql}
-                ORDER BY {sort_by} {sort_order}
-                LIMIT %s OFFSET %s
-            """
-            cursor.execute(sql, params + [per_page, offset])
-            logs = cursor.fetchall()
-            
-            # Convert datetime objects to strings and apply timezone conversion
-            for log in logs:
-                for key, value in log.items():
-                    if isinstance(value, datetime):
-                        dt_str = value.strftime('%Y-%m-%d %H:%M:%S')
-                        # Convert timezone for timestamp fields
-                        if key in ['received_timestamp', 'event_timestamp']:
-                            log[key] = convert_timezone(dt_str, target_tz)
-                        else:
-                            log[key] = dt_str
-            
-            return jsonify({
+            # Get total count (cached per filter combination; see count_cache)
+            if skip_count:
+                total = None
+            else:
+                count_key = (where_sql, tuple(params))
+                with count_cache_lock:
+                    total = count_cache.get(count_key)
+                if total is None:
+                    # Exact count even when unfiltered: total feeds
+                    # total_pages and the "Last" OFFSET jump, and the
+                    # information_schema row estimate can be off by tens of
+                    # percent, stranding or hiding the tail pages. The TTL
+                    # cache keeps it to one index scan per minute.
+                    count_sql = f"SELECT COUNT(*) as total FROM fns_logs {where_sql}"
+                    cursor.execute(count_sql, params)
+                    total = cursor.fetchone()['total']
+                    with count_cache_lock:
+                        count_cache[count_key] = total
+
+            # Get logs - use the keyset cursor when provided, falling back to
+            # OFFSET for cursor-less requests (e.g. page 1 or "Last" jumps).
+            # The rendered SQL is cached by its structural parts so repeat
+            # requests reuse the identical statement string, keeping the set
+            # of distinct statements MySQL sees small.
+            use_keyset = cursor_id is not None
+            sql_key = (tuple(active_filters), select_sql, sort_by, sort_order, use_keyset)
+            sql = _logs_sql_cache.get(sql_key)
+            if sql is None:
+                if use_keyset:
+                    comparator = '>' if sort_order == 'ASC' else '<'
+                    keyset_sql = f"({sort_by}, id) {comparator} (%s, %s)"
+                    keyset_where = f"{where_sql} AND {keyset_sql}" if where_sql else f"WHERE {keyset_sql}"
+                    sql = f"""
+                        SELECT {select_sql} FROM fns_logs
+                        {keyset_where}
+                        ORDER BY {sort_by} {sort_order}, id {sort_order}
+                        LIMIT %s
+                    """
+                else:
+                    sql = f"""
+                        SELECT {select_sql} FROM fns_logs
+                        {where_sql}
+                        ORDER BY {sort_by} {sort_order}, id {sort_order}
+                        LIMIT %s OFFSET %s
+                    """
+                if len(_logs_sql_cache) >= _LOGS_SQL_CACHE_MAX:
+                    _logs_sql_cache.clear()
+                _logs_sql_cache[sql_key] = sql
+            if use_keyset:
+                sql_args = tz_params + params + [cursor_sort_value, cursor_id, per_page]
+            else:
+                sql_args = tz_params + params + [per_page, offset]
+
+            # Stream rows with an unbuffered cursor instead of fetchall(),
+            # which would hold both pymysql's packet buffer and the full row
+            # list in memory at once. Each row is formatted as it arrives:
+            # the two timestamp fields become epoch milliseconds so the
+            # browser can format them in the user's timezone.
+            logs = []
+            last_key = None
+            with conn.cursor(pymysql.cursors.SSDictCursor) as ss_cursor:
+                ss_cursor.execute(sql, sql_args)
+                for log in ss_cursor:
+                    last_key = (log[sort_by], log['id'])
+                    log['received_timestamp_ms'] = _epoch_ms(log.pop('received_timestamp'))
+                    log['event_timestamp_ms'] = _epoch_ms(log.pop('event_timestamp'))
+                    logs.append(log)
+
+            # Build the cursor for the next page from the last row
+            next_cursor = None
+            if last_key is not None:
+                last_sort_value, last_id = last_key
+                if isinstance(last_sort_value, datetime):
+                    last_sort_value = last_sort_value.strftime('%Y-%m-%d %H:%M:%S.%f')
+                next_cursor = base64.urlsafe_b64encode(
+                    json.dumps([last_sort_value, last_id]).encode()
+                ).decode()
+
+            return _json_response({
                 'logs': logs,
                 'total': total,
                 'page': page,
                 'per_page': per_page,
-                'total_pages': (total + per_page - 1) // per_page
+                'total_pages': (total + per_page - 1) // per_page if total is not None else None,
+                'next_cursor': next_cursor
             })
     finally:
         conn.close()
 
-@app.route('/api/filter_options')
-def get_filter_options():
-    """Get distinct values for filter dropdowns"""
+def _load_filter_options():
+    """Run the four DISTINCT scans and return the filter dropdown values"""
     conn = get_db_connection()
     try:
         with conn.cursor() as cursor:
             options = {}
-            
+
             # Get distinct hostnames
             cursor.execute("SELECT DISTINCT hostname FROM fns_logs ORDER BY hostname")
             options['hostnames'] = [row['hostname'] for row in cursor.fetchall()]
-            
+
             # Get distinct actions
             cursor.execute("SELECT DISTINCT action FROM fns_logs ORDER BY action")
             options['actions'] = [row['action'] for row in cursor.fetchall()]
-            
+
             # Get distinct protocols
             cursor.execute("SELECT DISTINCT protocol FROM fns_logs ORDER BY protocol")
             options['protocols'] = [row['protocol'] for row in cursor.fetchall()]
-            
+
             # Get distinct rule names
             cursor.execute("SELECT DISTINCT rule_name FROM fns_logs ORDER BY rule_name")
             options['rule_names'] = [row['rule_name'] for row in cursor.fetchall()]
-            
-            return jsonify(options)
+
+            return options
     finally:
         conn.close()
 
-@app.route('/api/analytics/by_source')
-def analytics_by_source():
-    """Get traffic statistics by source IP"""
+
+def _refresh_filter_options_loop():
+    """Background refresh so requests rarely pay for the DISTINCT scans"""
+    import time
+    while True:
+        time.sleep(FILTER_OPTIONS_TTL)
+        try:
+            options = _load_filter_options()
+            with filter_options_lock:
+                filter_options_cache['options'] = options
+        except Exception as e:
+            # Leave the (possibly expired) cache alone; the next request
+            # will repopulate it on demand
+            print(f"Filter options refresh failed: {e}")
+
+
+threading.Thread(target=_refresh_filter_options_loop, daemon=True).start()
+
+
+@app.route('/api/filter_options')
+def get_filter_options():
+    """Get distinct values for filter dropdowns (cached)"""
+    with filter_options_lock:
+        options = filter_options_cache.get('options')
+    if options is None:
+        options = _load_filter_options()
+        with filter_options_lock:
+            filter_options_cache['options'] = options
+    return _cacheable_json_response(options, max_age=30)
+
+# Grouping columns the analytics endpoints may aggregate by (prevents SQL injection)
+ANALYTICS_COLUMNS = {
+    'source': 'source',
+    'destination': 'destination',
+    'port': 'destination_port',
+    'rule': 'rule_name',
+}
+
+def _analytics_query(cursor, group_col, limit, start_time, end_time):
+    """Run one traffic aggregate grouped by a whitelisted column"""
+    where_clauses = ["event_type = 'Destroy'"]
+    params = []
+
+    if start_time:
+        where_clauses.append("received_timestamp >= %s")
+        params.append(start_time)
+
+    if end_time:
+        where_clauses.append("received_timestamp <= %s")
+        params.append(end_time)
+
+    where_sql = "WHERE " + " AND ".join(where_clauses)
+
+    # total_bytes is a stored generated column (originator_bytes + reply_bytes)
+    # so the aggregate can run off the covering (event_type, <col>, total_bytes)
+    # indexes instead of computing the sum per row
+    sql = f"""
+        SELECT {group_col},
+               SUM(total_bytes) as total_bytes,
+               COUNT(*) as connection_count
+        FROM fns_logs
+        {where_sql}
+        GROUP BY {group_col}
+        ORDER BY total_bytes DESC
+        LIMIT %s
+    """
+    cursor.execute(sql, params + [limit])
+    return cursor.fetchall()
+
+def _analytics(group_key):
+    """Shared handler for the /api/analytics/by_* endpoints"""
     limit = int(request.args.get('limit', 10))
     start_time = request.args.get('start_time', '').strip()
     end_time = request.args.get('end_time', '').strip()
-    
+
     conn = get_db_connection()
     try:
         with conn.cursor() as cursor:
-            where_clauses = ["event_type = 'Destroy'"]
-            params = []
-            
-            if start_time:
-                where_clauses.append("received_timestamp >= %s")
-                params.append(start_time)
-            
-            if end_time:
-                where_clauses.append("received_timestamp <= %s")
-                params.append(end_time)
-            
-            where_sql = "WHERE " + " AND ".join(where_clauses)
-            
-            sql = f"""
-                SELECT source, 
-                       SUM(originator_bytes + reply_bytes) as total_bytes,
-                       COUNT(*) as connection_count
-                FROM fns_logs
-                {where_sql}
-                GROUP BY source
-                ORDER BY total_bytes DESC
-                LIMIT %s
-            """
-            cursor.execute(sql, params + [limit])
-            results = cursor.fetchall()
-            return jsonify(results)
+            results = _analytics_query(
+                cursor, ANALYTICS_COLUMNS[group_key], limit, start_time, end_time)
+            return _cacheable_json_response(results, max_age=30)
     finally:
         conn.close()
 
+@app.route('/api/analytics/by_source')
+def analytics_by_source():
+    """Get traffic statistics by source IP"""
+    return _analytics('source')
+
 @app.route('/api/analytics/by_destination')
 def analytics_by_destination():
     """Get traffic statistics by destination IP"""
-    limit = int(request.args.get('limit', 10))
-    start_time = request.args.get('start_time', '').strip()
-    end_time = request.args.get('end_time', '').strip()
-    
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cursor:
-            where_clauses = ["event_type = 'Destroy'"]
-            params = []
-            
-            if start_time:
-                where_clauses.append("received_timestamp >= %s")
-                params.append(start_time)
-            
-            if end_time:
-                where_clauses.append("received_timestamp <= %s")
-                params.append(end_time)
-            
-            where_sql = "WHERE " + " AND ".join(where_clauses)
-            
-            sql = f"""
-                SELECT destination, 
-                       SUM(originator_bytes + reply_bytes) as total_bytes,
-                       COUNT(*) as connection_count
-                FROM fns_logs
-                {where_sql}
-                GROUP BY destination
-                ORDER BY total_bytes DESC
-                LIMIT %s
-            """
-            cursor.execute(sql, params + [limit])
-            results = cursor.fetchall()
-            return jsonify(results)
-    finally:
-        conn.close()
+    return _analytics('destination')
 
 @app.route('/api/analytics/by_port')
 def analytics_by_port():
     """Get traffic statistics by destination port"""
-    limit = int(request.args.get('limit', 10))
-    start_time = request.args.get('start_time', '').strip()
-    end_time = request.args.get('end_time', '').strip()
-    
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cursor:
-            where_clauses = ["event_type = 'Destroy'"]
-            params = []
-            
-            if start_time:
-                where_clauses.append("received_timestamp >= %s")
-                params.append(start_time)
-            
-            if end_time:
-                where_clauses.append("received_timestamp <= %s")
-                params.append(end_time)
-            
-            where_sql = "WHERE " + " AND ".join(where_clauses)
-            
-            sql = f"""
-                SELECT destination_port, 
-                       SUM(originator_bytes + reply_bytes) as total_bytes,
-                       COUNT(*) as connection_count
-                FROM fns_logs
-                {where_sql}
-                GROUP BY destination_port
-                ORDER BY total_bytes DESC
-                LIMIT %s
-            """
-            cursor.execute(sql, params + [limit])
-            results = cursor.fetchall()
-            return jsonify(results)
-    finally:
-        conn.close()
+    return _analytics('port')
 
 @app.route('/api/analytics/by_rule')
 def analytics_by_rule():
     """Get traffic statistics by rule name"""
+    return _analytics('rule')
+
+@app.route('/api/analytics/all')
+def analytics_all():
+    """Get all four traffic aggregates in one request/connection"""
     limit = int(request.args.get('limit', 10))
     start_time = request.args.get('start_time', '').strip()
     end_time = request.args.get('end_time', '').strip()
-    
+
     conn = get_db_connection()
     try:
         with conn.cursor() as cursor:
-            where_clauses = ["event_type = 'Destroy'"]
-            params = []
-            
-            if start_time:
-                where_clauses.append("received_timestamp >= %s")
-                params.append(start_time)
-            
-            if end_time:
-                where_clauses.append("received_timestamp <= %s")
-                params.append(end_time)
-            
-            where_sql = "WHERE " + " AND ".join(where_clauses)
-            
-            sql = f"""
-                SELECT rule_name, 
-                       SUM(originator_bytes + reply_bytes) as total_bytes,
-                       COUNT(*) as connection_count
-                FROM fns_logs
-                {where_sql}
-                GROUP BY rule_name
-                ORDER BY total_bytes DESC
-                LIMIT %s
-            """
-            cursor.execute(sql, params + [limit])
-            results = cursor.fetchall()
-            return jsonify(results)
+            results = {
+                key: _analytics_query(cursor, col, limit, start_time, end_time)
+                for key, col in ANALYTICS_COLUMNS.items()
+            }
+            return _cacheable_json_response(results, max_age=30)
     finally:
         conn.close()
 
-@app.route('/api/statistics')
-def get_statistics():
-    """Get database statistics including size and average records per time period"""
-    conn = None
+def _stats_sizes():
+    """Database and table size figures from information_schema"""
+    conn = get_db_connection()
     try:
-        conn = get_db_connection()
         with conn.cursor() as cursor:
-            stats = {}
-            
-            # Get retention period
-            retention_days = APP_CONFIG['days_to_keep_logs']
-            cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
-            cutoff_date_str = cutoff_date.strftime('%Y-%m-%d %H:%M:%S')
-            
+            result = {}
+
             # Get database size
             cursor.execute("""
                 SELECT 
@@ -431,8 +610,8 @@ def get_statistics():
                 GROUP BY table_schema
             """, (DB_CONFIG['database'],))
             db_size_result = cursor.fetchone()
-            stats['database_size_mb'] = db_size_result['Size_MB'] if db_size_result else 0
-            
+            result['database_size_mb'] = db_size_result['Size_MB'] if db_size_result else 0
+
             # Get table size specifically
             cursor.execute("""
                 SELECT 
@@ -442,105 +621,160 @@ def get_statistics():
                 WHERE table_schema = %s AND table_name = 'fns_logs'
             """, (DB_CONFIG['database'],))
             table_size_result = cursor.fetchone()
-            stats['table_size_mb'] = table_size_result['Size_MB'] if table_size_result else 0
-            stats['table_rows'] = table_size_result['Rows'] if table_size_result else 0
-            
-            # Get total record count (within retention period)
+            result['table_size_mb'] = table_size_result['Size_MB'] if table_size_result else 0
+            result['table_rows'] = table_size_result['Rows'] if table_size_result else 0
+
+            return result
+    finally:
+        conn.close()
+
+
+def _stats_range(cutoff_date_str):
+    """Approximate retention-window total plus oldest/newest timestamps"""
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cursor:
+            result = {}
+
+            # Approximate the retention-window total from the optimizer's row
+            # estimate instead of an exact COUNT(*): on a multi-million-row
+            # table the exact count is the slowest query here, and the
+            # dashboard only needs a ballpark figure
             cursor.execute("""
-                SELECT COUNT(*) as total 
-                FROM fns_logs 
-                WHERE received_timestamp >= %s
+                EXPLAIN SELECT id FROM fns_logs WHERE received_timestamp >= %s
             """, (cutoff_date_str,))
-            stats['total_records'] = cursor.fetchone()['total']
-            
-            # Get oldest and newest timestamps
+            explain_row = cursor.fetchone()
+            result['total_records'] = int(explain_row['rows']) if explain_row and explain_row.get('rows') else 0
+
+            # MIN/MAX on the indexed column resolve via index seeks, not a scan
             cursor.execute("""
-                SELECT 
+                SELECT
                     MIN(received_timestamp) as oldest,
                     MAX(received_timestamp) as newest
                 FROM fns_logs
                 WHERE received_timestamp >= %s
             """, (cutoff_date_str,))
             time_range = cursor.fetchone()
-            stats['oldest_timestamp'] = time_range['oldest'].strftime('%Y-%m-%d %H:%M:%S') if time_range['oldest'] else None
-            stats['newest_timestamp'] = time_range['newest'].strftime('%Y-%m-%d %H:%M:%S') if time_range['newest'] else None
-            
-            # Calculate average records per time period (only for data within retention period)
-            now = datetime.utcnow()
-            cutoff_datetime = datetime.strptime(cutoff_date_str, '%Y-%m-%d %H:%M:%S')
-            
-            # Average per minute (last hour)
-            hour_ago = now - timedelta(hours=1)
-            # Use the more recent of the two dates (retention cutoff or time period start)
-            period_start = max(cutoff_datetime, hour_ago)
-            cursor.execute("""
-                SELECT COUNT(*) as count 
-                FROM fns_logs 
-                WHERE received_timestamp >= %s
-            """, (period_start.strftime('%Y-%m-%d %H:%M:%S'),))
-            hour_count = cursor.fetchone()['count']
-            stats['avg_per_minute'] = round(hour_count / 60.0, 2) if hour_count > 0 else 0
-            
-            # Average per hour (last 24 hours)
-            day_ago = now - timedelta(days=1)
-            # Use the more recent of the two dates (retention cutoff or time period start)
-            period_start = max(cutoff_datetime, day_ago)
-            cursor.execute("""
-                SELECT COUNT(*) as count 
-                FROM fns_logs 
-                WHERE received_timestamp >= %s
-            """, (period_start.strftime('%Y-%m-%d %H:%M:%S'),))
-            day_count = cursor.fetchone()['count']
-            stats['avg_per_hour'] = round(day_count / 24.0, 2) if day_count > 0 else 0
-            
-            # Average per day (last 7 days, but not exceeding retention period)
-            week_days = min(7, retention_days)
-            week_ago = now - timedelta(days=week_days)
-            # Use the more recent of the two dates (retention cutoff or time period start)
-            period_start = max(cutoff_datetime, week_ago)
+            result['oldest_timestamp'] = time_range['oldest'].strftime('%Y-%m-%d %H:%M:%S') if time_range['oldest'] else None
+            result['newest_timestamp'] = time_range['newest'].strftime('%Y-%m-%d %H:%M:%S') if time_range['newest'] else None
+
+            return result
+    finally:
+        conn.close()
+
+
+def _stats_buckets(hour_start, day_start, week_start, month_start):
+    """Conditional-aggregation time buckets over the widest averaging window"""
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cursor:
+            # One conditional-aggregation query computes every time bucket in a
+            # single pass, scanning only the widest averaging window (at most
+            # four weeks) rather than the whole retention period
+            scan_start = min(hour_start, day_start, week_start, month_start)
             cursor.execute("""
-                SELECT COUNT(*) as count 
-                FROM fns_logs 
+                SELECT
+                    COALESCE(SUM(received_timestamp >= %s), 0) as hour_count,
+                    COALESCE(SUM(received_timestamp >= %s), 0) as day_count,
+                    COALESCE(SUM(received_timestamp >= %s), 0) as week_count,
+                    COALESCE(SUM(received_timestamp >= %s), 0) as month_count
+                FROM fns_logs
                 WHERE received_timestamp >= %s
-            """, (period_start.strftime('%Y-%m-%d %H:%M:%S'),))
-            week_count = cursor.fetchone()['count']
-            stats['avg_per_day'] = round(week_count / float(week_days), 2) if week_count > 0 else 0
-            
-            # Average per week (last 4 weeks, but not exceeding retention period)
-            month_weeks = min(4, retention_days // 7)
-            if month_weeks > 0:
-                month_weeks_ago = now - timedelta(weeks=month_weeks)
-                # Use the more recent of the two dates (retention cutoff or time period start)
-                period_start = max(cutoff_datetime, month_weeks_ago)
-                cursor.execute("""
-                    SELECT COUNT(*) as count 
-                    FROM fns_logs 
-                    WHERE received_timestamp >= %s
-                """, (period_start.strftime('%Y-%m-%d %H:%M:%S'),))
-                month_weeks_count = cursor.fetchone()['count']
-                stats['avg_per_week'] = round(month_weeks_count / float(month_weeks), 2) if month_weeks_count > 0 else 0
-            else:
-                stats['avg_per_week'] = 0
-            
-            # Average per month (entire retention period, but not exceeding retention period)
-            retention_weeks = retention_days / 7.0
-            retention_months = retention_weeks / 4.0
-            if retention_months > 0:
-                stats['avg_per_month'] = round(stats['total_records'] / retention_months, 2) if stats['total_records'] > 0 else 0
-            else:
-                stats['avg_per_month'] = 0
-            
-            # Add retention period info
-            stats['retention_days'] = retention_days
-            stats['cutoff_date'] = cutoff_date_str
-            
-            return jsonify(stats)
+            """, (
+                hour_start.strftime('%Y-%m-%d %H:%M:%S'),
+                day_start.strftime('%Y-%m-%d %H:%M:%S'),
+                week_start.strftime('%Y-%m-%d %H:%M:%S'),
+                month_start.strftime('%Y-%m-%d %H:%M:%S'),
+                scan_start.strftime('%Y-%m-%d %H:%M:%S'),
+            ))
+            return cursor.fetchone()
+    finally:
+        conn.close()
+
+
+def _compute_statistics():
+    """Gather database statistics; the route caches the result for STATISTICS_TTL"""
+    stats = {}
+
+    # Get retention period
+    retention_days = RETENTION_DAYS
+    cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
+    cutoff_date_str = cutoff_date.strftime('%Y-%m-%d %H:%M:%S')
+
+    # Calculate the start of each averaging window, clamped to the
+    # retention cutoff so short retention periods don't skew averages
+    now = datetime.utcnow()
+    cutoff_datetime = datetime.strptime(cutoff_date_str, '%Y-%m-%d %H:%M:%S')
+    hour_start = max(cutoff_datetime, now - timedelta(hours=1))
+    day_start = max(cutoff_datetime, now - timedelta(days=1))
+    week_days = min(7, retention_days)
+    week_start = max(cutoff_datetime, now - timedelta(days=week_days))
+    month_weeks = min(4, retention_days // 7)
+    month_start = max(cutoff_datetime, now - timedelta(weeks=month_weeks)) if month_weeks > 0 else now
+
+    # The three query groups are independent and I/O-bound on the database,
+    # so run them concurrently on separate pooled connections: wall time is
+    # the slowest of the three instead of their sum
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        sizes_future = executor.submit(_stats_sizes)
+        range_future = executor.submit(_stats_range, cutoff_date_str)
+        buckets_future = executor.submit(
+            _stats_buckets, hour_start, day_start, week_start, month_start)
+        stats.update(sizes_future.result())
+        stats.update(range_future.result())
+        buckets = buckets_future.result()
+
+    # Average per minute (last hour)
+    hour_count = int(buckets['hour_count'])
+    stats['avg_per_minute'] = round(hour_count / 60.0, 2) if hour_count > 0 else 0
+
+    # Average per hour (last 24 hours)
+    day_count = int(buckets['day_count'])
+    stats['avg_per_hour'] = round(day_count / 24.0, 2) if day_count > 0 else 0
+
+    # Average per day (last 7 days, but not exceeding retention period)
+    week_count = int(buckets['week_count'])
+    stats['avg_per_day'] = round(week_count / float(week_days), 2) if week_count > 0 else 0
+
+    # Average per week (last 4 weeks, but not exceeding retention period)
+    if month_weeks > 0:
+        month_weeks_count = int(buckets['month_count'])
+        stats['avg_per_week'] = round(month_weeks_count / float(month_weeks), 2) if month_weeks_count > 0 else 0
+    else:
+        stats['avg_per_week'] = 0
+
+    # Average per month (entire retention period, but not exceeding retention period)
+    retention_weeks = retention_days / 7.0
+    retention_months = retention_weeks / 4.0
+    if retention_months > 0:
+        stats['avg_per_month'] = round(stats['total_records'] / retention_months, 2) if stats['total_records'] > 0 else 0
+    else:
+        stats['avg_per_month'] = 0
+
+    # Add retention period info
+    stats['retention_days'] = retention_days
+    stats['cutoff_date'] = cutoff_date_str
+
+    return stats
+
+
+@app.route('/api/statistics')
+def get_statistics():
+    """Get database statistics including size and average records per time period"""
+    try:
+        with statistics_lock:
+            stats = statistics_cache.get('stats')
+        if stats is None:
+            stats = _compute_statistics()
+            with statistics_lock:
+                statistics_cache['stats'] = stats
+        return _cacheable_json_response(stats, max_age=STATISTICS_TTL)
     except Exception as e:
         # Log the error and return a proper error response
         import traceback
         print(f"Error in get_statistics: {e}")
         traceback.print_exc()
-        return jsonify({
+        return _json_response({
             'error': str(e),
             'database_size_mb': 0,
             'table_size_mb': 0,
@@ -550,15 +784,12 @@ def get_statistics():
             'avg_per_day': 0,
             'avg_per_week': 0,
             'avg_per_month': 0,
-            'retention_days': APP_CONFIG.get('days_to_keep_logs', 30),
+            'retention_days': RETENTION_DAYS,
             'cutoff_date': None,
             'oldest_timestamp': None,
             'newest_timestamp': None,
             'table_rows': 0
         }), 500
-    finally:
-        if conn:
-            conn.close()
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+import types
 import pymysql
 
 # Try to load .env file if python-dotenv is available
@@ -9,18 +10,24 @@ except ImportError:
     # python-dotenv not installed, user must set environment variables manually
     pass
 
-APP_CONFIG = {
+# Both mappings are wrapped in MappingProxyType so no importing module can
+# accidentally mutate shared configuration at runtime.
+APP_CONFIG = types.MappingProxyType({
     'days_to_keep_logs': int(os.getenv('FNS_DAYS_TO_KEEP_LOGS', 30)), # Number of days to keep logs in the database
     'default_timezone': os.getenv('FNS_DEFAULT_TIMEZONE', 'UTC'), # Default timezone for the app
-}
+})
 
-DB_CONFIG = {
+DB_CONFIG = types.MappingProxyType({
     'host': os.getenv('FNS_DB_HOST', '127.0.0.1'), # IP address or hostname of database server
     'user': os.getenv('FNS_DB_USER', 'rsyslog'), # Username for database
     'password': os.getenv('FNS_DB_PASSWORD', ''), # Password for database (REQUIRED - set via environment variable)
     'database': os.getenv('FNS_DB_NAME', 'Syslog'), # Database name
     'cursorclass': pymysql.cursors.DictCursor # Cursor class for database
-}
+})
+
+# Retention period as a plain module constant for hot paths that would
+# otherwise do a dict lookup per call
+RETENTION_DAYS = APP_CONFIG['days_to_keep_logs']
 
 # Validate that required password is set
 if not DB_CONFIG['password']:
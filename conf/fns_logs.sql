@@ -19,11 +19,28 @@ CREATE TABLE fns_logs (
     reply_packets BIGINT UNSIGNED NOT NULL,
     reply_bytes BIGINT UNSIGNED NOT NULL,
     description TEXT NULL,
+    total_bytes BIGINT UNSIGNED AS (originator_bytes + reply_bytes) STORED,
     INDEX idx_received_timestamp (received_timestamp),
-    INDEX idx_hostname (hostname),
+    INDEX idx_received_timestamp_id (received_timestamp, id),
     INDEX idx_event_timestamp (event_timestamp),
     INDEX idx_rule_uuid (rule_uuid),
-    INDEX idx_source (source),
-    INDEX idx_destination (destination),
-    INDEX idx_action (action)
+    -- Each filter column paired with the default sort column, so a filtered
+    -- /api/logs query is an index range scan instead of a filesort. These
+    -- also cover single-column lookups on their leading column.
+    INDEX idx_hostname_ts (hostname, received_timestamp),
+    INDEX idx_source_ts (source, received_timestamp),
+    INDEX idx_destination_ts (destination, received_timestamp),
+    INDEX idx_action_ts (action, received_timestamp),
+    INDEX idx_protocol_ts (protocol, received_timestamp),
+    INDEX idx_rule_name_ts (rule_name, received_timestamp),
+    INDEX idx_event_type_ts (event_type, received_timestamp),
+    INDEX idx_evt_src_total (event_type, source, total_bytes),
+    INDEX idx_evt_dst_total (event_type, destination, total_bytes),
+    INDEX idx_evt_port_total (event_type, destination_port, total_bytes),
+    INDEX idx_evt_rule_total (event_type, rule_name, total_bytes),
+    -- FULLTEXT indexes backing the boolean-mode prefix filters in /api/logs
+    FULLTEXT INDEX idx_ft_hostname (hostname),
+    FULLTEXT INDEX idx_ft_source (source),
+    FULLTEXT INDEX idx_ft_destination (destination),
+    FULLTEXT INDEX idx_ft_rule_name (rule_name)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
\ No newline at end of file
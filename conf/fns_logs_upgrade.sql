@@ -0,0 +1,42 @@
+-- Upgrade statements for existing fns_logs installations.
+-- New installations get all of this from fns_logs.sql; run the statements
+-- below against databases created from an older version of that file.
+-- Each ALTER rebuilds indexes, so expect it to take a while on large tables.
+
+-- Composite index backing the default sort and keyset pagination
+ALTER TABLE fns_logs
+    ADD INDEX idx_received_timestamp_id (received_timestamp, id);
+
+-- Composite filter + sort indexes so filtered /api/logs queries run as
+-- index range scans instead of filesorts. The single-column indexes they
+-- replace are covered by the leading column and can be dropped.
+ALTER TABLE fns_logs
+    ADD INDEX idx_hostname_ts (hostname, received_timestamp),
+    ADD INDEX idx_source_ts (source, received_timestamp),
+    ADD INDEX idx_destination_ts (destination, received_timestamp),
+    ADD INDEX idx_action_ts (action, received_timestamp),
+    ADD INDEX idx_protocol_ts (protocol, received_timestamp),
+    ADD INDEX idx_rule_name_ts (rule_name, received_timestamp),
+    ADD INDEX idx_event_type_ts (event_type, received_timestamp),
+    DROP INDEX idx_hostname,
+    DROP INDEX idx_source,
+    DROP INDEX idx_destination,
+    DROP INDEX idx_action;
+
+-- FULLTEXT indexes so word-token filters use boolean-mode prefix matching
+-- instead of unindexable '%xxx%' LIKE scans. Added one at a time: InnoDB
+-- only builds the first FULLTEXT index on a table in-place.
+ALTER TABLE fns_logs ADD FULLTEXT INDEX idx_ft_hostname (hostname);
+ALTER TABLE fns_logs ADD FULLTEXT INDEX idx_ft_source (source);
+ALTER TABLE fns_logs ADD FULLTEXT INDEX idx_ft_destination (destination);
+ALTER TABLE fns_logs ADD FULLTEXT INDEX idx_ft_rule_name (rule_name);
+
+-- Stored generated column so analytics aggregates read a precomputed sum
+-- instead of adding originator_bytes + reply_bytes per row, plus covering
+-- indexes for each GROUP BY used by /api/analytics/*
+ALTER TABLE fns_logs
+    ADD COLUMN total_bytes BIGINT UNSIGNED AS (originator_bytes + reply_bytes) STORED,
+    ADD INDEX idx_evt_src_total (event_type, source, total_bytes),
+    ADD INDEX idx_evt_dst_total (event_type, destination, total_bytes),
+    ADD INDEX idx_evt_port_total (event_type, destination_port, total_bytes),
+    ADD INDEX idx_evt_rule_total (event_type, rule_name, total_bytes);
@@ -0,0 +1,14 @@
+"""WSGI entry point for running the app under gunicorn (or any WSGI server).
+
+Usage:
+    gunicorn -k gthread -w 4 --threads 8 -b 0.0.0.0:5000 wsgi:app
+
+Each worker process gets its own database connection pool, so size the
+pool (see DBConnectionPool in app.py) and thread count together: threads
+per worker should not exceed the pool's max_size.
+"""
+
+from app import app
+
+if __name__ == '__main__':
+    app.run()